@@ -80,3 +80,259 @@ Needless to say, Counter objects are a tremendously useful tool for almost any k
 you need to tabulate and count data. You should prefer this over manually written solutions involving 
 dictionaries.
 """
+
+"""
+One thing to keep in mind is that a Counter has an entry for every distinct item it has ever seen. 
+When counting an endless stream of data (e.g., words in log messages or IP addresses in network 
+traffic), it can grow without limit. If approximate counts are good enough, there are data structures 
+that count in a fixed amount of memory while still giving guarantees about how far off the answers 
+can be.
+
+A Count-Min sketch is a small table of counters with one row per hash function. Each item adds its 
+count to one counter in every row, and the estimate for an item is the smallest of its counters. 
+Collisions can only make counts too large, never too small. To also support most_common(), the 
+following version keeps track of a fixed number of the items with the largest estimates:
+"""
+import math
+from array import array
+from collections import Counter
+from itertools import islice
+import pickle
+from hashlib import blake2b
+
+def _to_bytes(item):
+    # A leading type tag keeps 1, '1' and b'1' apart
+    if isinstance(item, bytes):
+        return b'b' + item
+    if isinstance(item, str):
+        return b's' + item.encode('utf-8', 'surrogatepass')
+    # A fixed protocol keeps the encoding the same between processes and Python versions
+    return b'p' + pickle.dumps(item, protocol=4)
+
+def _stable_hash(item):
+    # Built-in hash() of strings differs between processes, which would make sketches unmergeable
+    h = blake2b(_to_bytes(item), digest_size=16).digest()
+    return int.from_bytes(h[:8], 'little'), int.from_bytes(h[8:], 'little') | 1
+
+class CountMinSketch(object):
+    def __init__(self, width, depth, track=0):
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._table = array('q', bytes(8 * width * depth))
+        self._track = track
+        self._candidates = {}           # Possible heavy hitters -> estimated count
+        self._floor = 0                 # No more than the smallest count in _candidates
+
+    @classmethod
+    def from_error(cls, epsilon, delta, track=0):
+        # Estimates exceed the true count by at most epsilon * total with probability 1 - delta
+        return cls(math.ceil(math.e / epsilon), math.ceil(math.log(1 / delta)), track)
+
+    def _cells(self, item):
+        h1, h2 = _stable_hash(item)
+        width = self.width
+        return [row * width + (h1 + row * h2) % width for row in range(self.depth)]
+
+    def add(self, item, count=1):
+        table = self._table
+        cells = self._cells(item)
+        for cell in cells:
+            table[cell] += count
+        self.total += count
+        if self._track:
+            self._offer(item, min(table[cell] for cell in cells))
+
+    def update(self, iterable, batchsize=10000):
+        if hasattr(iterable, 'items'):
+            for item, count in iterable.items():
+                self.add(item, count)
+        else:
+            # Counting each batch exactly first means repeated items only get hashed once per batch
+            it = iter(iterable)
+            for batch in iter(lambda: list(islice(it, batchsize)), []):
+                self.update(Counter(batch))
+
+    def __getitem__(self, item):
+        table = self._table
+        return min(table[cell] for cell in self._cells(item))
+
+    def _offer(self, item, estimate):
+        candidates = self._candidates
+        if item in candidates or len(candidates) < self._track:
+            candidates[item] = estimate
+        elif estimate > self._floor:
+            smallest = min(candidates, key=candidates.get)
+            self._floor = candidates[smallest]
+            if estimate > self._floor:
+                del candidates[smallest]
+                candidates[item] = estimate
+
+    def most_common(self, n=None):
+        counts = sorted(((self[item], item) for item in self._candidates), key=lambda c: c[0], reverse=True)
+        return [(item, count) for count, item in counts[:n]]
+
+    def _combine(self, other, sign):
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError('sketches must have the same dimensions')
+        result = CountMinSketch(self.width, self.depth, max(self._track, other._track))
+        result._table = array('q', (max(a + sign * b, 0) for a, b in zip(self._table, other._table)))
+        result.total = max(self.total + sign * other.total, 0)
+        for item in set(self._candidates) | set(other._candidates):
+            # Like Counter, drop items whose count is no longer positive
+            estimate = result[item]
+            if estimate > 0:
+                result._offer(item, estimate)
+        return result
+
+    def __add__(self, other):
+        return self._combine(other, 1)
+
+    def __sub__(self, other):
+        return self._combine(other, -1)
+
+"""
+The from_error() method sizes the table from the error you're willing to accept. For example, to have 
+estimates be off by no more than 1% of the total count, with 99% probability:
+"""
+sketch = CountMinSketch.from_error(0.01, 0.01, track=3)
+sketch.update(words)
+print(sketch.width, sketch.depth)
+# 272 5
+print(sketch.most_common(3))
+# [('eyes', 8), ('the', 5), ('look', 4)]
+print(sketch['not'], sketch['gaze'])
+# 1 0
+
+"""
+That table takes up about 11KB, no matter how many distinct items are added to it. Items are hashed with 
+hashlib rather than hash(), since the hash of a string changes from one run of Python to the next. 
+Items other than strings and bytes are pickled first, with a type tag so that 1, '1' and b'1' don't 
+share counters. The pickle of a set of strings depends on their hash order, though, so convert such 
+items to something stable first (e.g., a sorted tuple). That way, sketches built in different processes 
+with the same dimensions can be combined with + and -:
+"""
+more_sketch = CountMinSketch.from_error(0.01, 0.01, track=3)
+more_sketch.update(morewords)
+print((sketch + more_sketch).most_common(3))
+# [('eyes', 9), ('the', 5), ('look', 4)]
+
+"""
+Subtraction only makes sense if the counts being subtracted were added in the first place, such as when 
+removing an old time window from a running total. Negative counters are clipped to zero, and items 
+whose estimate drops to zero are no longer reported by most_common(), like Counter.
+
+The update() method counts each batch of items exactly using a Counter before adding them to the table. 
+Frequent items then only need to be hashed once per batch, and the batch size limits the memory used. 
+For 1,000,000 words following a typical skewed distribution, this took 0.26 seconds versus 0.06 
+seconds for a Counter.
+
+A different approach is the Space-Saving algorithm, which counts exactly K items. When a new item 
+shows up and there's no room for it, it replaces the item with the smallest count, and takes over that 
+count as well (since it's possible that the new item was seen that many times already). This means 
+every count is at least as large as the true count, and the amount that each count might be too large by 
+is recorded along with it:
+"""
+class SpaceSaving(object):
+    def __init__(self, k):
+        self.k = k
+        self.total = 0
+        self._counts = {}       # Monitored item -> count (never less than the true count)
+        self._errors = {}       # Monitored item -> maximum overestimate of its count
+        self._buckets = {}      # Count -> items with that count (dict used as an ordered set)
+        self._min = 0
+
+    def _discard(self, item, count):
+        bucket = self._buckets[count]
+        del bucket[item]
+        if not bucket:
+            del self._buckets[count]
+
+    def _set_count(self, item, old, new):
+        if item in self._counts:
+            self._discard(item, old)
+        self._buckets.setdefault(new, {})[item] = None
+        self._counts[item] = new
+        if new < self._min or self._min not in self._buckets:
+            self._min = min(self._buckets)
+
+    def add(self, item, count=1):
+        # Like Counter.most_common(), ignore counts that aren't positive (e.g. left by subtract())
+        if count <= 0:
+            return
+        self.total += count
+        counts = self._counts
+        if item in counts:
+            self._set_count(item, counts[item], counts[item] + count)
+        elif len(counts) < self.k:
+            self._errors[item] = 0
+            self._set_count(item, 0, count)
+        else:
+            # Take over the slot of an item with the smallest count. Its count is
+            # an upper bound on how many times the new item might have been seen already.
+            low = self._min
+            victim = next(iter(self._buckets[low]))
+            self._discard(victim, low)
+            del counts[victim], self._errors[victim]
+            self._errors[item] = low
+            self._set_count(item, 0, low + count)
+
+    def update(self, iterable, batchsize=10000):
+        if hasattr(iterable, 'items'):
+            for item, count in iterable.items():
+                self.add(item, count)
+        else:
+            it = iter(iterable)
+            for batch in iter(lambda: list(islice(it, batchsize)), []):
+                self.update(Counter(batch))
+
+    def __getitem__(self, item):
+        return self._counts.get(item, 0)
+
+    def error(self, item):
+        return self._errors.get(item, self._min if len(self._counts) == self.k else 0)
+
+    def most_common(self, n=None):
+        counts = sorted(self._counts.items(), key=lambda c: c[1], reverse=True)
+        return counts[:n]
+
+    def __add__(self, other):
+        # Items missing from a full summary may have been seen up to its minimum count times
+        floor1 = self._min if len(self._counts) == self.k else 0
+        floor2 = other._min if len(other._counts) == other.k else 0
+        merged = []
+        for item in set(self._counts) | set(other._counts):
+            count = self._counts.get(item, floor1) + other._counts.get(item, floor2)
+            error = self._errors.get(item, floor1) + other._errors.get(item, floor2)
+            merged.append((count, error, item))
+        merged.sort(key=lambda m: m[0], reverse=True)
+        result = SpaceSaving(max(self.k, other.k))
+        for count, error, item in merged[:result.k]:
+            result._errors[item] = error
+            result._set_count(item, 0, count)
+        result.total = self.total + other.total
+        return result
+
+"""
+No count is ever overestimated by more than the total divided by K, so any item that occurs more 
+often than that is guaranteed to be monitored. Here's how the results depend on K:
+"""
+for k in (4, 6, 7):
+    top = SpaceSaving(k)
+    for word in words:
+        top.add(word)
+    print(k, [(word, count, top.error(word)) for word, count in top.most_common(3)])
+# 4 [('eyes', 8, 0), ('the', 7, 2), ("you're", 7, 6)]
+# 6 [('eyes', 8, 0), ('the', 5, 0), ('look', 4, 2)]
+# 7 [('eyes', 8, 0), ('the', 5, 0), ('look', 4, 0)]
+
+"""
+Items are grouped into buckets by count, so finding an item with the smallest count doesn't require 
+looking through all K of them. Summaries can be merged with +, in which case an item missing from one 
+of them is assumed to have the smallest count in that summary (or zero, if it wasn't full). There's no 
+subtraction, since removing counts would break the guarantees.
+
+Space-Saving is usually the better choice when you only care about the most common items, since it uses 
+less memory for the same accuracy on those items. A Count-Min sketch is better if you need estimates 
+for arbitrary items or need to subtract counts.
+"""
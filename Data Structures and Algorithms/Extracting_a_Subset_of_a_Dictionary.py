@@ -44,3 +44,114 @@ However, a timing study reveals that this solution is almost 1.6 times slower th
 If performance matters, it usually pays to spend a bit of time studying it. See "Profiling and Timing 
 Your Program" for specific information about timing and profiling.
 """
+
+"""
+Both comprehensions test every item in the dictionary. For the second one, that isn't necessary. If the 
+set of names you want is much smaller than the dictionary, loop over the names instead, and let the 
+dictionary's own hash table do the work of finding them:
+"""
+p3 = { key:prices[key] for key in tech_names if key in prices }
+
+"""
+With a dictionary of 5 million prices and a set of 1,100 names, this took 0.2 milliseconds, against 
+0.23 seconds for the comprehension that tests every item in the dictionary. The keys view version also 
+did well on data this lopsided, at 0.9 milliseconds, since intersecting with a set loops over the 
+smaller side.
+
+Selecting by value has no such shortcut, since every value has to be looked at. If the values are 
+numbers and you're going to make many different selections from the same dictionary, you can copy the 
+values into a NumPy array once and test them all with a single array operation. The resulting array 
+of Booleans can then be used with itertools.compress() to pick out the matching items:
+"""
+from itertools import compress
+import numpy as np
+
+class DictSelector(object):
+    def __init__(self, mapping, dtype=float):
+        # The mapping can't be changed while the selector is in use, as the array would be out of date
+        self.mapping = mapping
+        self.values = np.fromiter(mapping.values(), dtype=dtype, count=len(mapping))
+
+    def select(self, predicate):
+        # predicate is given the array of values, and returns an array of Booleans
+        mask = predicate(self.values)
+        return dict(compress(self.mapping.items(), mask.tolist()))
+
+"""
+For example:
+"""
+selector = DictSelector(prices)
+p4 = selector.select(lambda values: values > 200)
+# p4 is {'AAPL': 612.78, 'IBM': 205.55}
+p5 = selector.select(lambda values: (values > 20) & (values < 100))
+# p5 is {'ACME': 45.23, 'HPQ': 37.2}
+
+"""
+When the values aren't numbers, or the test can't be written with array operations, the work can 
+still be split among several processes. On Unix, a process started by fork() gets a copy of its 
+parent's memory for free, so the dictionary doesn't need to be pickled and sent to the workers. 
+Each worker just needs to know which part of it to filter. Only the selected items are sent back:
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+_shared = None      # Lists of the keys and values being filtered, which forked workers inherit
+
+def _select_range(predicate, start, stop):
+    # Slicing the lists goes straight to the range, where islice() over the mapping would step
+    # through every item before it
+    keys, values = _shared
+    return {key: value for key, value in zip(keys[start:stop], values[start:stop]) if predicate(value)}
+
+def select_parallel(mapping, predicate, workers=None):
+    global _shared
+    workers = workers or os.cpu_count()
+    size = max(1, -(-len(mapping) // workers))
+    _shared = (list(mapping), list(mapping.values()))
+    try:
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(workers, mp_context=context) as pool:
+            futures = [pool.submit(_select_range, predicate, start, start + size)
+                       for start in range(0, len(mapping), size)]
+            result = {}
+            for future in futures:
+                result.update(future.result())
+    finally:
+        _shared = None
+    return result
+
+"""
+The predicate has to be a function defined at the top level of a module, so that it can be pickled:
+"""
+def over_200(value):
+    return value > 200
+
+p6 = select_parallel(prices, over_200, workers=2)
+# p6 is {'AAPL': 612.78, 'IBM': 205.55}
+
+"""
+The workers get consecutive ranges of items, and their results are combined in order, so the keys 
+come out in the same order as with a comprehension. Here are timings for a dictionary of 5 million 
+random prices, selecting either 1% or 50% of them:
+
+    Test                                        1% selected    50% selected
+    Dictionary comprehension                       0.45s           1.85s
+    DictSelector.select()                          0.19s           1.52s
+    select_parallel(), 1 worker                    1.39s           5.51s
+    select_parallel(), 2 workers, single CPU       1.45s           5.61s
+
+Creating the DictSelector took another 0.17 seconds, which is only worth paying if you make several 
+selections. When half the items are selected, most of the time goes into building the new dictionary, 
+which no amount of array cleverness can avoid.
+
+The only machine available for these timings had one CPU, so select_parallel() had no chance of 
+helping. It also shows the overhead. Even though the dictionary isn't pickled, a worker that reads 
+the items updates their reference counts, which forces the operating system to copy the memory pages 
+holding them, and every selected item has to be pickled to get it back to the parent. That's why the 
+parent first copies the keys and values into two lists (0.15 seconds here), so that each worker can 
+slice out its own range. Using islice() on the dictionary's items instead would make every worker 
+step through, and so touch, all of the items before its range. Parallel selection is worth considering 
+only when the predicate does real work for each item, few items are selected, and you have several 
+cores to spread the work over. The 'fork' start method isn't available on Windows.
+"""
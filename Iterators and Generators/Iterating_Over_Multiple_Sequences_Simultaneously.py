@@ -95,3 +95,76 @@ zip(c, d)
 # Returns <zip object at 0x1074952a8>
 list(zip(c, d))
 # Returns [(1, 10), (2, 11), (3, 12)]
+
+"""
+When the sequences are large columns of numbers, producing a tuple for every element is a lot of 
+overhead, especially if the values are only going to be combined using arithmetic. If the columns 
+are NumPy arrays (or anything that can be viewed as one, such as an array.array), you can zip them 
+together in batches instead. Each batch is a tuple of aligned slices, which are views into the 
+original arrays rather than copies:
+"""
+import numpy as np
+
+def zip_batches(*columns, batchsize=65536):
+	columns = [np.asarray(c) for c in columns]
+	# Like zip(), no columns means no batches
+	n = min((len(c) for c in columns), default=0)
+	for start in range(0, n, batchsize):
+		stop = min(start + batchsize, n)
+		yield tuple(c[start:stop] for c in columns)
+
+def zip_longest_batches(*columns, batchsize=65536, fillvalue=np.nan):
+	columns = [np.asarray(c) for c in columns]
+	n = max((len(c) for c in columns), default=0)
+	# Only made for columns that run short, since fillvalue may not suit the others (e.g. NaN and strings)
+	fills = [None] * len(columns)
+	for start in range(0, n, batchsize):
+		stop = min(start + batchsize, n)
+		batch = []
+		for i, c in enumerate(columns):
+			if stop <= len(c):
+				batch.append(c[start:stop])
+				continue
+			if fills[i] is None:
+				fills[i] = np.full(batchsize, fillvalue, dtype=np.result_type(c, fillvalue))
+			if start >= len(c):
+				batch.append(fills[i][:stop-start])
+			else:
+				batch.append(np.concatenate((c[start:], fills[i][:stop-len(c)])))
+		yield tuple(batch)
+
+"""
+Here is how they work:
+"""
+x = np.arange(10)
+y = np.arange(7) * 1.5
+for bx, by in zip_batches(x, y, batchsize=3):
+	print(bx, by)
+# [0 1 2] [0.  1.5 3. ]
+# [3 4 5] [4.5 6.  7.5]
+# [6] [9.]
+
+for bx, by in zip_longest_batches(x, y, batchsize=4):
+	print(bx, by)
+# [0 1 2 3] [0.  1.5 3.  4.5]
+# [4 5 6 7] [6.  7.5 9.  nan]
+# [8 9] [nan nan]
+
+"""
+As with izip_longest(), missing values are filled in with fillvalue, except that the default is NaN 
+instead of None, since None can't be stored in a numeric array. The padding is taken from a block of 
+fill values that is created once, so only the single batch that straddles the end of a shorter column 
+ever gets copied. Note that a column of integers padded with NaN comes out as floats for those batches.
+
+The payoff comes from operating on whole batches at once. For example, computing the dot product of 
+two 10,000,000 element columns:
+
+>>> from timeit import timeit
+>>> timeit(lambda: sum(x*y for x, y in zip(xl, yl)), number=1)
+0.7733232799999996
+>>> timeit(lambda: sum((bx*by).sum() for bx, by in zip_batches(xs, ys)), number=1)
+0.021220183000025372
+>>>
+
+Here xs and ys are NumPy arrays, and xl and yl are the same values as Python lists.
+"""
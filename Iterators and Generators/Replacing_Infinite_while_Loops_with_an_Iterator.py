@@ -48,3 +48,83 @@ This recipe simply takes these two features and combines them together into a si
 The use of lambda in the solution is needed to create a callable that takes no arguments, 
 yet still supplies the desired size argument to recv() or read().
 """
+
+"""
+One downside of the iter() idiom is that every call to read() or recv() allocates a brand new bytes 
+object, only to throw it away once the chunk has been processed. In a program that does nothing but 
+move data around, that's a lot of allocator churn. If the consumer only needs to look at each chunk 
+briefly, you can read into a small pool of preallocated buffers instead and hand out memoryviews:
+"""
+def iter_chunks(readinto, size=8192, max_size=262144, min_size=4096, nbuffers=2):
+    buffers = [memoryview(bytearray(max_size)) for _ in range(nbuffers)]
+    n = 0
+    while True:
+        buf = buffers[n % nbuffers]
+        n += 1
+        nread = readinto(buf[:size])
+        if not nread:
+            break
+        yield buf[:nread]
+        # Grow the chunk size while reads fill the buffer, shrink it when they come back mostly empty
+        if nread == size:
+            size = min(size * 2, max_size)
+        elif nread < size // 4:
+            size = max(size // 2, min_size)
+
+"""
+Like iter(), iter_chunks() is given a callable rather than a file, so the same function works for 
+files, sockets, and pipes:
+"""
+def reader(s):
+    for chunk in iter_chunks(s.recv_into):
+        process_data(chunk)
+
+with open('somefile.data', 'rb') as f:
+    for chunk in iter_chunks(f.readinto):
+        n = sys.stdout.buffer.write(chunk)
+
+"""
+The chunk size adapts to how fast data is actually arriving. When a read completely fills the 
+buffer, more data is probably waiting, so the next read asks for twice as much. When a read comes 
+back less than a quarter full (as often happens with sockets and pipes), the size is cut in half. 
+For example, reading from a pipe quickly settles on the 64KB pipe buffer size used on Linux:
+"""
+import os
+import threading
+
+r, w = os.pipe()
+pw = os.fdopen(w, 'wb')
+pr = os.fdopen(r, 'rb', buffering=0)
+t = threading.Thread(target=lambda: (pw.write(bytes(3000000)), pw.close()))
+t.start()
+print([len(chunk) for chunk in iter_chunks(pr.readinto)][:8])
+# [8192, 16384, 32768, 65536, 65536, 65536, 65536, 65536]
+t.join()
+pr.close()
+
+"""
+Reading a 69MB file this way is also about twice as fast as iter(partial(f.read, 8192), b''), 
+mostly because far fewer reads are made once the chunk size has grown:
+
+>>> from functools import partial
+>>> from timeit import timeit
+>>> def old():
+...     with open('big.log', 'rb') as f:
+...         for chunk in iter(partial(f.read, 8192), b''):
+...             pass
+...
+>>> def new():
+...     with open('big.log', 'rb') as f:
+...         for chunk in iter_chunks(f.readinto):
+...             pass
+...
+>>> timeit(old, number=10) / 10
+0.021061733800002
+>>> timeit(new, number=10) / 10
+0.01125860520000117
+>>>
+
+The catch is that each memoryview is only valid until its buffer comes around again in the pool 
+(with the default of two buffers, that's two chunks later). If you need to hold on to the data any 
+longer than that, make a copy using bytes(chunk).
+"""